@@ -1,13 +1,30 @@
 # api/index.py - 원본 HTML 파일을 사용하도록 수정
 
 from flask import Flask, jsonify, request, send_from_directory, render_template_string
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.security import safe_join
+import orjson
 import time
 import os
+import hashlib
+import gzip
+import mimetypes
+import json
+import math
+import re
+import sqlite3
+import tempfile
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from cachetools import TLRUCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 import logging
 import sys
+import threading
+import uuid
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,7 +38,29 @@ logger = logging.getLogger(__name__)
 # Flask 앱 초기화
 # ============================================
 
-app = Flask(__name__)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def dumps_json_bytes(obj):
+    """orjson으로 UTF-8 JSON bytes 직렬화"""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=ORJSON_OPTIONS)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/get_json에서 orjson을 사용하는 JSON 프로바이더"""
+    
+    def dumps(self, obj, **kwargs):
+        return dumps_json_bytes(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # str 변환 없이 bytes를 그대로 응답 본문으로 사용
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_json_bytes(obj), mimetype=self.mimetype)
+
+# 정적 파일은 루트의 static/ 디렉토리에서 직접 서빙하므로 기본 static 라우트는 사용하지 않음
+app = Flask(__name__, static_folder=None)
+app.json = OrjsonProvider(app)
 
 # CORS 설정
 CORS(app, resources={
@@ -37,43 +76,288 @@ CORS(app, resources={
 # ============================================
 
 IS_VERCEL = os.environ.get('VERCEL_ENV') is not None
+VERCEL_REGION = os.environ.get('VERCEL_REGION', 'unknown')
+VERCEL_ENV = os.environ.get('VERCEL_ENV', 'unknown')
 FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
 FMP_STABLE_URL = "https://financialmodelingprep.com/stable"
+EXCHANGE_RATE_BASE_URL = "https://api.exchangerate-api.com"
 FMP_API_KEY = os.environ.get('FMP_API_KEY', 'demo')
+STRATEGY_DB_PATH = os.environ.get(
+    'STRATEGY_DB_PATH',
+    os.path.join(tempfile.gettempdir(), 'invest-strategies.db')
+)
 
 # 글로벌 저장소
-strategies = {}
-cache = {}
 CACHE_DURATION = 300
+QUOTE_CACHE_DURATION = 60
+SEARCH_CACHE_DURATION = 3600
+NOT_FOUND_CACHE_DURATION = 60  # 없는 종목(None 결과)은 오타 반복 조회만 막을 만큼 짧게
+CACHE_MAX_SIZE = 1024
+
+# 캐시 키의 첫 요소(종류)별 유지 시간 (초), 목록에 없으면 CACHE_DURATION
+CACHE_DURATIONS = {
+    'stock': QUOTE_CACHE_DURATION,
+    'search': SEARCH_CACHE_DURATION
+}
+EXCHANGE_RATE_CACHE_KEY = ('exchange_rate',)
+
+# 유효 기간이 지난 뒤에도 이 배수만큼의 시간까지는 이전 값으로 응답하면서 백그라운드에서 갱신
+STALE_CACHE_FACTOR = 2
+
+def cache_duration(key, value):
+    """캐시 항목 유효 기간 (시세는 짧게, 검색 결과는 길게 유지)"""
+    if value is None:
+        return NOT_FOUND_CACHE_DURATION
+    return CACHE_DURATIONS.get(key[0], CACHE_DURATION)
+
+def cache_expiry(key, item, now):
+    """캐시 항목 삭제 시각 (이전 값으로 응답할 수 있는 기간까지 보관)"""
+    return now + cache_duration(key, item[0]) * STALE_CACHE_FACTOR
+
+cache = TLRUCache(maxsize=CACHE_MAX_SIZE, ttu=cache_expiry, timer=time.monotonic)
+cache_lock = threading.Lock()
+inflight = {}  # 캐시 키 -> 진행 중인 조회의 Future
+# 캐시 값은 (값, 갱신이 필요한 시각) 튜플로 저장
+
+# 응답 캐시 정책 (s-maxage는 Vercel Edge 캐시에 적용)
+API_CACHE_CONTROL = f'public, s-maxage={CACHE_DURATION}, stale-while-revalidate=60'
+STOCK_CACHE_CONTROL = f'public, s-maxage={QUOTE_CACHE_DURATION}, stale-while-revalidate=60'
+NO_STORE_CACHE_CONTROL = 'no-store'
+STRATEGY_CACHE_CONTROL = 'private, no-cache'  # 저장 시 바로 바뀌므로 매번 ETag로 재검증
+DEFAULT_EXCHANGE_RATE = 1300.0
+STRATEGY_NUMBER_FIELDS = (
+    'basePrice', 'investmentAmount', 'dropRate',
+    'firstTargetProfit', 'otherTargetProfit'
+)
+
+# 입력 검증 (잘못된 입력으로 캐시 키를 만들거나 FMP를 호출하지 않도록)
+SYMBOL_PATTERN = re.compile(r'\^?[A-Za-z0-9][A-Za-z0-9.\-]{0,14}')  # AAPL, BRK-B, 005930.KS, ^GSPC
+SEARCH_QUERY_MAX_LENGTH = 64
 
 # API 설정
 API_TIMEOUT = 8
 MAX_RETRIES = 2
 RETRY_DELAY = 0.5
-RATE_LIMIT = 0.3
-last_api_request = 0
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+# 같은 키를 먼저 조회 중인 요청을 기다리는 최대 시간 (Vercel 기본 실행 제한 10초 안에 응답)
+INFLIGHT_WAIT_TIMEOUT = 9
+
+# 배치 요청 설정
+BATCH_MAX_REQUESTS = 20
+QUOTES_MAX_SYMBOLS = 50
+
+# 콜드 스타트 때 시세를 미리 받아 둘 자주 조회되는 종목 (FMP 요청 한 번으로 조회)
+WARMUP_SYMBOLS = ('AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META')
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# ============================================
+# HTTP 세션 (커넥션 풀 재사용)
+# ============================================
+
+HTTP_SESSION = requests.Session()
+# MAX_RETRIES는 첫 시도를 포함한 총 시도 횟수이므로 재시도는 그보다 하나 적게.
+# 429의 Retry-After는 대기 상한이 없어 Vercel 실행 제한을 넘길 수 있으므로 따르지 않음
+HTTP_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=MAX_RETRIES - 1,
+        backoff_factor=RETRY_DELAY,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=False
+    )
+))
+# 환율은 실패하면 기본값을 쓰므로 재시도 없이 한 번만 시도
+HTTP_SESSION.mount(EXCHANGE_RATE_BASE_URL, HTTPAdapter(max_retries=0))
+
+# ============================================
+# 전략 저장소 (SQLite)
+# ============================================
+
+# 인스턴스가 살아있는 동안 재시작 후에도 전략이 유지되도록 파일에 저장
+strategy_db = None
+strategy_db_lock = threading.Lock()
+
+def get_strategy_db():
+    """전략 저장용 SQLite 연결 (처음 사용할 때 생성)"""
+    global strategy_db
+    
+    if strategy_db is None:
+        conn = sqlite3.connect(STRATEGY_DB_PATH, check_same_thread=False)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS strategies ('
+            'id TEXT PRIMARY KEY, data TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+        conn.commit()
+        strategy_db = conn
+    
+    return strategy_db
+
+def list_strategies():
+    """저장된 전략 목록을 저장 순서대로 반환"""
+    with strategy_db_lock:
+        rows = get_strategy_db().execute(
+            'SELECT data FROM strategies ORDER BY created_at'
+        ).fetchall()
+    
+    return [json.loads(row[0]) for row in rows]
+
+def save_strategy(strategy_data):
+    """새 전략 저장 (같은 id가 이미 있으면 덮어쓰지 않고 IntegrityError)"""
+    with strategy_db_lock:
+        db = get_strategy_db()
+        db.execute(
+            'INSERT INTO strategies (id, data, created_at) VALUES (?, ?, ?)',
+            (strategy_data['id'], json.dumps(strategy_data, ensure_ascii=False), time.time())
+        )
+        db.commit()
 
 # ============================================
 # 원본 HTML 파일 읽기 (Vercel 환경용)
 # ============================================
 
+# Vercel에서는 루트 디렉토리에서 정적 파일 찾기
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 브라우저/엣지에서 5분간 재사용하고, 이후 1시간까지는 이전 본문을 주면서 백그라운드에서 재검증
+INDEX_CACHE_CONTROL = 'public, max-age=300, stale-while-revalidate=3600'
+STATIC_CACHE_CONTROL = 'public, max-age=300'
+# index.html의 정적 파일 주소에는 내용 ETag(?v=)가 붙으므로 버전이 맞는 요청은 바뀌지 않음
+VERSIONED_STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# HTML 본문을 파싱하기 전에 브라우저(또는 103 Early Hints를 지원하는 프록시)가 먼저 받도록 알림
+INDEX_PRELOAD_ASSETS = (('app.css', 'style'), ('app.js', 'script'))
+
+# index.html 안의 "/static/..." 주소 (버전을 붙일 대상)
+STATIC_URL_PATTERN = re.compile(r'(?<=")/static/([\w./-]+)(?=")')
+
+# 매수 차수 표의 행 마크업 (첫 화면 행과 app.js가 복제하는 <template>이 함께 사용)
+INVESTMENT_ROW_HTML = (
+    '<tr><td><strong>{order}</strong></td>'
+    '<td class="calculated-drop-rate">{drop_rate}</td>'
+    '<td class="basePrice">-</td>'
+    '<td class="calculated-quantity">-</td>'
+    '<td class="actual-investment">-</td>'
+    '<td>{manage}</td></tr>'
+)
+REMOVE_ROW_BUTTON_HTML = '<button class="remove-btn" data-action="removeInvestmentRow">삭제</button>'
+INITIAL_INVESTMENT_ROWS = 4
+INITIAL_DROP_RATE_STEP = 5  # index.html의 dropRate 입력 기본값과 동일
+INVESTMENT_ROWS_MARKER = '<!-- investment-rows -->'
+INVESTMENT_ROW_TEMPLATE_MARKER = '<!-- investment-row-template -->'
+
+# 파일명 -> (본문 bytes, ETag, gzip 압축 본문, 최종 수정 시각)
+STATIC_CACHE = {}
+GZIP_MIN_SIZE = 1024  # 이보다 작은 파일은 압축 이득이 적어 원본 그대로 전송
+
+def make_etag(body):
+    """응답 본문으로 강한 ETag 값 생성"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def build_static_entry(data):
+    """파일 본문으로 (본문, ETag, gzip 본문, 최종 수정 시각) 튜플 생성 (압축은 한 번만 수행)"""
+    gzipped = gzip.compress(data, compresslevel=9) if len(data) >= GZIP_MIN_SIZE else None
+    # 배포 파일의 mtime은 신뢰할 수 없으므로 처음 읽은 시각 사용 (항상 배포 이후라 잘못된 304가 생기지 않음)
+    return data, make_etag(data), gzipped, time.time()
+
+# 문자열 리터럴은 그대로 두고 주석과 불필요한 공백만 제거
+CSS_TOKEN_PATTERN = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/|\s*([{};,])\s*|:\s+|\s+''',
+    re.S
+)
+
+def minify_css_token(match):
+    string, punct = match.group(1), match.group(2)
+    if string:
+        return string
+    if punct:
+        return punct
+    token = match.group(0)
+    if token.startswith('/*'):
+        return ''
+    return ':' if token.startswith(':') else ' '
+
+def minify_css(text):
+    """CSS 주석과 공백 제거 (규칙 자체는 변경하지 않음)"""
+    return CSS_TOKEN_PATTERN.sub(minify_css_token, text).strip()
+
+def load_static_file(filename):
+    """정적 파일을 한 번만 읽어 메모리에 보관 (배포 단위로 불변)"""
+    entry = STATIC_CACHE.get(filename)
+    
+    if entry is None:
+        with open(os.path.join(ROOT_DIR, filename), 'rb') as f:
+            data = f.read()
+        if filename.endswith('.css'):
+            data = minify_css(data.decode('utf-8')).encode('utf-8')
+        elif filename == 'index.html':
+            data = add_investment_rows(add_static_versions(data.decode('utf-8'))).encode('utf-8')
+        entry = build_static_entry(data)
+        STATIC_CACHE[filename] = entry
+    
+    return entry
+
+def static_url(name):
+    """정적 파일 주소에 내용 ETag를 붙임 (배포로 내용이 바뀌면 주소도 바뀜)"""
+    return f"/static/{name}?v={load_static_file(f'static/{name}')[1]}"
+
+def add_static_versions(html):
+    """HTML의 정적 파일 주소에 버전 추가 (HTML과 CSS/JS가 서로 다른 배포본으로 섞이지 않도록)"""
+    def replace(match):
+        try:
+            return static_url(match.group(1))
+        except OSError:
+            return match.group(0)
+    
+    return STATIC_URL_PATTERN.sub(replace, html)
+
+def add_investment_rows(html):
+    """매수 차수 초기 행과 행 <template>을 HTML에 삽입 (JS 실행 전에도 표가 채워지도록)"""
+    rows = ''.join(
+        INVESTMENT_ROW_HTML.format(
+            order=f'{index + 1}차',
+            drop_rate=f'{index * INITIAL_DROP_RATE_STEP}%',
+            manage='-' if index == 0 else REMOVE_ROW_BUTTON_HTML
+        )
+        for index in range(INITIAL_INVESTMENT_ROWS)
+    )
+    template = INVESTMENT_ROW_HTML.format(order='', drop_rate='', manage=REMOVE_ROW_BUTTON_HTML)
+    
+    return (html.replace(INVESTMENT_ROWS_MARKER, rows)
+                .replace(INVESTMENT_ROW_TEMPLATE_MARKER, template))
+
 def get_index_html():
-    """원본 HTML 파일 내용을 반환"""
+    """원본 HTML 파일을 정적 항목 튜플로 반환"""
     try:
-        # Vercel에서는 루트 디렉토리에서 index.html 찾기
-        html_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'index.html')
-        
-        if os.path.exists(html_path):
-            with open(html_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        else:
-            # 파일이 없으면 기본 HTML 반환
-            logger.warning("index.html 파일을 찾을 수 없습니다")
-            return get_fallback_html()
-            
+        return load_static_file('index.html')
+    except FileNotFoundError:
+        # 파일이 없으면 기본 HTML 반환
+        logger.warning("index.html 파일을 찾을 수 없습니다")
     except Exception as e:
         logger.error(f"HTML 파일 읽기 오류: {e}")
-        return get_fallback_html()
+    
+    return build_static_entry(get_fallback_html().encode('utf-8'))
+
+def static_response(entry, mimetype, cache_control):
+    """정적 항목으로 응답 생성 (gzip 지원 시 압축본 전송, If-None-Match 일치 시 304)"""
+    body, etag, gzipped, last_modified = entry
+    response = app.response_class(mimetype=mimetype)
+    
+    # 'in' 검사는 q 값을 무시하므로 gzip;q=0(거부)도 통과함. 품질 값으로 판단
+    if gzipped is not None and request.accept_encodings['gzip'] > 0:
+        response.set_data(gzipped)
+        response.headers['Content-Encoding'] = 'gzip'
+        # 인코딩별 본문이 다르므로 ETag도 구분
+        etag = f"{etag}-gzip"
+    else:
+        response.set_data(body)
+    
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
 
 def get_fallback_html():
     """원본 HTML이 없을 때 사용할 대체 HTML"""
@@ -267,218 +551,469 @@ def get_fallback_html():
 def index():
     """메인 페이지 - 원본 HTML 파일 반환"""
     try:
-        html_content = get_index_html()
-        return html_content
+        response = static_response(get_index_html(), 'text/html', INDEX_CACHE_CONTROL)
+        response.headers['Link'] = ', '.join(
+            f'<{static_url(name)}>; rel=preload; as={kind}'
+            for name, kind in INDEX_PRELOAD_ASSETS
+        )
+        return response
     except Exception as e:
         logger.error(f"Index page error: {e}")
         return get_fallback_html()
 
+@app.route('/static/<path:filename>')
+def static_files(filename):
+    """정적 파일 (CSS/JS) 반환"""
+    path = safe_join('static', filename)
+    if path is None:
+        return not_found(None)
+    
+    try:
+        entry = load_static_file(path)
+    except (FileNotFoundError, IsADirectoryError):
+        return not_found(None)
+    
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if request.args.get('v') == entry[1]:
+        cache_control = VERSIONED_STATIC_CACHE_CONTROL
+    else:
+        cache_control = STATIC_CACHE_CONTROL
+    return static_response(entry, mimetype, cache_control)
+
 # ============================================
 # 헬퍼 함수들
 # ============================================
 
-def rate_limit():
-    """API 요청 간격 조절"""
-    global last_api_request
-    current_time = time.time()
-    elapsed = current_time - last_api_request
+class TokenBucket:
+    """호스트별 요청 속도 제한용 토큰 버킷 (스레드 안전)"""
     
-    if elapsed < RATE_LIMIT:
-        time.sleep(RATE_LIMIT - elapsed)
+    __slots__ = ('rate', 'capacity', 'tokens', 'last', 'lock')
     
-    last_api_request = time.time()
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """토큰 하나를 확보하고, 부족하면 채워질 때까지 대기"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            
+            # 토큰을 먼저 차감해 순서를 예약하고, 대기는 잠금 밖에서 수행
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+FMP_BUCKET = TokenBucket(rate=RATE_LIMIT_PER_SECOND, capacity=RATE_LIMIT_BURST)
+FMP_BASE_PARAMS = {'apikey': FMP_API_KEY}
 
 def make_fmp_request(endpoint, params=None):
     """FMP API 요청"""
     try:
-        rate_limit()
-        
-        if params is None:
-            params = {}
+        FMP_BUCKET.acquire()
         
-        params['apikey'] = FMP_API_KEY
+        # 호출한 쪽의 params는 수정하지 않고 API 키를 합친 새 dict 사용
+        query = {**params, **FMP_BASE_PARAMS} if params else FMP_BASE_PARAMS
         url = f"{FMP_BASE_URL}/{endpoint}"
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.get(url, params=params, timeout=API_TIMEOUT)
-                response.raise_for_status()
-                data = response.json()
-                
-                if isinstance(data, dict) and 'Error Message' in data:
-                    raise Exception(data['Error Message'])
-                
-                return data
-                
-            except Exception as e:
-                if attempt == MAX_RETRIES - 1:
-                    raise e
-                time.sleep(RETRY_DELAY)
+        # 재시도와 백오프는 세션에 마운트된 Retry가 처리
+        response = HTTP_SESSION.get(url, params=query, timeout=API_TIMEOUT)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        
+        # 정상 응답은 대부분 list이므로 정확한 타입 비교로 바로 통과
+        if type(data) is dict and 'Error Message' in data:
+            raise Exception(data['Error Message'])
+        
+        return data
                 
     except Exception as e:
         logger.error(f"FMP API request failed: {str(e)}")
         raise e
 
+def cache_store(key, value):
+    """캐시에 값 저장 (cache_lock을 잡은 상태에서 호출)"""
+    cache[key] = (value, time.monotonic() + cache_duration(key, value))
+
+def cache_get_or_compute(key, compute):
+    """캐시에 값이 있으면 반환하고, 없으면 compute()로 계산해 저장
+    
+    (값, 캐시 적중 여부)를 반환하며 None 결과(없는 종목)는 짧게 캐시해 FMP를 반복 호출하지 않음.
+    같은 키를 동시에 요청하면 업스트림 호출은 한 번만 수행하고 나머지는 그 결과를 기다림.
+    유효 기간이 지난 값은 그대로 반환하고 갱신은 백그라운드에서 한 번만 수행
+    """
+    with cache_lock:
+        try:
+            value, refresh_at = cache[key]
+        except KeyError:
+            pass
+        else:
+            if time.monotonic() >= refresh_at and key not in inflight:
+                future = inflight[key] = Future()
+                EXECUTOR.submit(compute_cache_entry, key, compute, future)
+            return value, True
+        
+        future = inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            inflight[key] = future
+    
+    if not is_owner:
+        # 먼저 조회한 요청이 멈춰도 무한정 기다리지 않음 (시간 초과 시 TimeoutError)
+        return future.result(timeout=INFLIGHT_WAIT_TIMEOUT), True
+    
+    return compute_cache_entry(key, compute, future), False
+
+def compute_cache_entry(key, compute, future):
+    """compute() 결과를 캐시에 저장하고 같은 키를 기다리는 요청에 전달"""
+    try:
+        value = compute()
+    except Exception as e:
+        with cache_lock:
+            inflight.pop(key, None)
+        future.set_exception(e)
+        raise
+    
+    with cache_lock:
+        cache_store(key, value)
+        inflight.pop(key, None)
+    
+    future.set_result(value)
+    return value
+
+iso_now_cache = (0, '')  # (초 단위 시각, ISO 문자열)
+
+def iso_now():
+    """현재 UTC 시각 ISO 문자열 (같은 초 안에서는 재사용)"""
+    global iso_now_cache
+    
+    now = int(time.time())
+    if now != iso_now_cache[0]:
+        iso_now_cache = (now, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now)))
+    
+    return iso_now_cache[1]
+
+def build_json_entry(data):
+    """응답 본문을 미리 직렬화해 (본문, ETag) 튜플로 반환"""
+    body = dumps_json_bytes(data)
+    return body, make_etag(body)
+
+def cached_json_response(entry, cache_control=None):
+    """직렬화된 캐시 항목으로 응답 생성 (If-None-Match 일치 시 304)"""
+    body, etag = entry
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
+
+def etag_json_response(data, cache_control):
+    """JSON 응답에 Cache-Control과 본문 기반 ETag 추가 (If-None-Match 일치 시 304)"""
+    response = jsonify(data)
+    response.headers['Cache-Control'] = cache_control
+    response.add_etag()
+    return response.make_conditional(request)
+
+def fetch_search_results(query):
+    """FMP 검색 결과를 응답 형식으로 변환"""
+    search_data = make_fmp_request("search", {"query": query, "limit": 10})
+    
+    if not search_data:
+        return []
+    
+    return [
+        {
+            'symbol': item['symbol'],
+            'name': item['name'],
+            'exchange': item.get('exchangeShortName', 'Unknown'),
+            'currency': item.get('currency', 'USD'),
+            'type': 'stock'
+        }
+        for item in search_data[:10]
+    ]
+
+def as_float(value, default=None):
+    """FMP 숫자 필드를 float로 변환 (대부분 이미 float이며, null이나 잘못된 값이면 기본값)"""
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def build_stock_data(quote, symbol):
+    """FMP 시세 항목을 응답 형식으로 변환 (가격이 없으면 None)"""
+    price = as_float(quote.get('price'))
+    if price is None:
+        return None
+    
+    return {
+        'symbol': quote['symbol'],
+        'name': quote.get('name', symbol),
+        'price': price,
+        'change': as_float(quote.get('change'), 0.0),
+        'changePercent': as_float(quote.get('changesPercentage'), 0.0),
+        'currency': 'USD',
+        'timestamp': datetime.now().isoformat(),
+        'source': 'fmp_api'
+    }
+
+def fetch_stock_quote(symbol):
+    """FMP 시세 조회 (종목이 없으면 None)"""
+    quote_data = make_fmp_request(f"quote/{symbol}")
+    
+    if not quote_data or len(quote_data) == 0:
+        return None
+    
+    return build_stock_data(quote_data[0], symbol)
+
+def fetch_stock_quotes(symbols):
+    """여러 종목 시세를 FMP 요청 한 번으로 조회 ({심볼: 시세} 반환)"""
+    quote_data = make_fmp_request(f"quote/{','.join(symbols)}")
+    
+    if not quote_data:
+        return {}
+    
+    stocks = {}
+    for quote in quote_data:
+        if quote.get('symbol') in symbols:
+            stock_data = build_stock_data(quote, quote['symbol'])
+            if stock_data is not None:
+                stocks[quote['symbol']] = stock_data
+    
+    return stocks
+
+def load_stock_entries(symbols):
+    """종목별 시세 캐시 항목 조회 ({심볼: 직렬화된 항목 또는 None})
+    
+    유효 기간 안의 캐시 항목(없는 종목으로 확인된 None 포함)은 그대로 쓰고,
+    나머지 종목만 FMP 요청 한 번으로 받아 /api/stock/<symbol>과 같은 키로 캐시
+    """
+    now = time.monotonic()
+    with cache_lock:
+        cached = {symbol: cache.get(('stock', symbol)) for symbol in symbols}
+    entries = {
+        symbol: hit[0]
+        for symbol, hit in cached.items()
+        if hit is not None and now < hit[1]
+    }
+    to_fetch = [symbol for symbol in symbols if symbol not in entries]
+    
+    if to_fetch:
+        fetched = fetch_stock_quotes(to_fetch)
+        with cache_lock:
+            for symbol in to_fetch:
+                stock_data = fetched.get(symbol)
+                entry = None if stock_data is None else build_json_entry(stock_data)
+                cache_store(('stock', symbol), entry)
+                entries[symbol] = entry
+    
+    return entries
+
+def fetch_exchange_rate():
+    """USD/KRW 환율 조회 (실패 시 기본값 사용)"""
+    try:
+        response = HTTP_SESSION.get(
+            f'{EXCHANGE_RATE_BASE_URL}/v4/latest/USD',
+            timeout=5
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        rate = data['rates'].get('KRW', DEFAULT_EXCHANGE_RATE)
+    except:
+        rate = DEFAULT_EXCHANGE_RATE
+    
+    return {
+        'rate': rate,
+        'timestamp': datetime.now().isoformat(),
+        'source': 'API' if rate != DEFAULT_EXCHANGE_RATE else 'Default'
+    }
+
+def load_exchange_rate_entry():
+    """환율 응답을 직렬화된 캐시 항목으로 반환 (캐시 적중 시 다시 직렬화하지 않음)"""
+    return build_json_entry(fetch_exchange_rate())
+
 # ============================================
 # API 엔드포인트들 (기존과 동일)
 # ============================================
 
+# 인스턴스가 살아있는 동안 바뀌지 않는 상태 정보
+STATUS_STATIC = {
+    'environment': 'vercel' if IS_VERCEL else 'local',
+    'fmp_key': '설정됨' if FMP_API_KEY != 'demo' else '데모키',
+    'python_version': f"{sys.version_info.major}.{sys.version_info.minor}",
+    'cache_max_size': CACHE_MAX_SIZE
+}
+
+if IS_VERCEL:
+    STATUS_STATIC['vercel_info'] = {
+        'region': VERCEL_REGION,
+        'env': VERCEL_ENV
+    }
+
 @app.route('/api/status')
 def api_status():
     """API 상태 확인"""
     try:
         status = {
             'status': 'ok',
-            'timestamp': datetime.utcnow().isoformat(),
-            'environment': 'vercel' if IS_VERCEL else 'local',
-            'fmp_key': '설정됨' if FMP_API_KEY != 'demo' else '데모키',
-            'python_version': f"{sys.version_info.major}.{sys.version_info.minor}",
+            'timestamp': iso_now(),
+            **STATUS_STATIC,
             'cache_size': len(cache)
         }
         
-        if IS_VERCEL:
-            status['vercel_info'] = {
-                'region': os.environ.get('VERCEL_REGION', 'unknown'),
-                'env': os.environ.get('VERCEL_ENV', 'unknown')
-            }
-        
-        return jsonify(status)
+        response = jsonify(status)
+        response.headers['Cache-Control'] = NO_STORE_CACHE_CONTROL
+        return response
         
     except Exception as e:
         logger.error(f"Status check error: {e}")
         return jsonify({
             'status': 'error',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }), 500
 
+# 모니터링이 가장 자주 호출하므로 직렬화 없이 시각만 채워 넣는 본문 템플릿
+HEALTH_BODY_TEMPLATE = b'{"status":"healthy","timestamp":"%s"}'
+
 @app.route('/api/health')
 def health_check():
     """헬스체크"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat()
-    })
+    response = app.response_class(
+        HEALTH_BODY_TEMPLATE % iso_now().encode(),
+        mimetype='application/json'
+    )
+    response.headers['Cache-Control'] = NO_STORE_CACHE_CONTROL
+    return response
 
 @app.route('/api/search/<query>')
 def search_stocks(query):
     """주식 검색"""
+    if not query.strip():
+        return jsonify({
+            'query': query,
+            'results': [],
+            'count': 0,
+            'error': '검색어를 입력해주세요'
+        }), 400
+    
+    if len(query) > SEARCH_QUERY_MAX_LENGTH:
+        return jsonify({
+            'results': [],
+            'count': 0,
+            'error': f'검색어는 {SEARCH_QUERY_MAX_LENGTH}자 이하로 입력해주세요'
+        }), 400
+    
     try:
-        if not query or len(query.strip()) < 1:
-            return jsonify({
-                'query': query,
-                'results': [],
-                'count': 0,
-                'error': '검색어를 입력해주세요'
-            }), 400
+        # 캐시 확인 후 없으면 FMP API 검색
+        results, cached = cache_get_or_compute(
+            ('search', query.lower()),
+            lambda: fetch_search_results(query)
+        )
         
-        # 캐시 확인
-        cache_key = f"search_{query.lower()}"
-        current_time = time.time()
+        return etag_json_response({
+            'query': query,
+            'results': results[:10],
+            'count': len(results),
+            'source': 'cache' if cached else 'api'
+        }, API_CACHE_CONTROL)
         
-        if cache_key in cache and (current_time - cache[cache_key]['time']) < CACHE_DURATION:
-            return jsonify({
-                'query': query,
-                'results': cache[cache_key]['data'][:10],
-                'count': len(cache[cache_key]['data']),
-                'source': 'cache'
-            })
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        return jsonify({
+            'query': query,
+            'results': [],
+            'count': 0,
+            'error': '검색 중 오류가 발생했습니다'
+        }), 500
+
+@app.route('/api/stock/<symbol>')
+def get_stock_data(symbol):
+    """주식 정보 조회"""
+    try:
+        if not SYMBOL_PATTERN.fullmatch(symbol):
+            return jsonify({'error': '올바르지 않은 주식 심볼입니다'}), 400
         
-        # FMP API 검색
+        # 캐시 확인 후 없으면 주식 정보 조회
         try:
-            search_data = make_fmp_request("search", {"query": query, "limit": 10})
+            def load_stock_entry():
+                stock_data = fetch_stock_quote(symbol.upper())
+                return None if stock_data is None else build_json_entry(stock_data)
             
-            results = []
-            if search_data:
-                for item in search_data[:10]:
-                    results.append({
-                        'symbol': item['symbol'],
-                        'name': item['name'],
-                        'exchange': item.get('exchangeShortName', 'Unknown'),
-                        'currency': item.get('currency', 'USD'),
-                        'type': 'stock'
-                    })
+            entry, _ = cache_get_or_compute(('stock', symbol.upper()), load_stock_entry)
             
-            # 캐시 저장
-            cache[cache_key] = {
-                'data': results,
-                'time': current_time
-            }
+            if entry is None:
+                return jsonify({'error': f'주식 정보를 찾을 수 없습니다: {symbol}'}), 404
             
-            return jsonify({
-                'query': query,
-                'results': results,
-                'count': len(results),
-                'source': 'api'
-            })
+            return cached_json_response(entry, STOCK_CACHE_CONTROL)
             
         except Exception as e:
-            logger.error(f"Search error: {e}")
+            logger.error(f"Stock data error: {e}")
             return jsonify({
-                'query': query,
-                'results': [],
-                'count': 0,
-                'error': '검색 중 오류가 발생했습니다'
+                'error': '주식 정보를 가져올 수 없습니다',
+                'details': str(e)
             }), 500
             
     except Exception as e:
-        logger.error(f"Search endpoint error: {e}")
+        logger.error(f"Stock endpoint error: {e}")
         return jsonify({
             'error': '서버 오류가 발생했습니다',
             'details': str(e)
         }), 500
 
-@app.route('/api/stock/<symbol>')
-def get_stock_data(symbol):
-    """주식 정보 조회"""
+@app.route('/api/quotes')
+def get_stock_quotes():
+    """여러 종목 시세 일괄 조회 (?symbols=AAPL,MSFT)"""
     try:
-        if not symbol:
+        # 순서를 유지하면서 중복 심볼 제거
+        symbols = list(dict.fromkeys(
+            symbol.strip().upper()
+            for symbol in request.args.get('symbols', '').split(',')
+            if symbol.strip()
+        ))
+        
+        if not symbols:
             return jsonify({'error': '주식 심볼을 입력해주세요'}), 400
         
-        # 캐시 확인
-        cache_key = f"stock_{symbol.upper()}"
-        current_time = time.time()
+        if len(symbols) > QUOTES_MAX_SYMBOLS:
+            return jsonify({
+                'error': f'한 번에 최대 {QUOTES_MAX_SYMBOLS}개 종목까지 조회할 수 있습니다'
+            }), 400
         
-        if cache_key in cache and (current_time - cache[cache_key]['time']) < CACHE_DURATION:
-            return jsonify(cache[cache_key]['data'])
+        if not all(SYMBOL_PATTERN.fullmatch(symbol) for symbol in symbols):
+            return jsonify({'error': '올바르지 않은 주식 심볼이 포함되어 있습니다'}), 400
         
-        # 주식 정보 조회
         try:
-            quote_data = make_fmp_request(f"quote/{symbol.upper()}")
-            
-            if not quote_data or len(quote_data) == 0:
-                return jsonify({'error': f'주식 정보를 찾을 수 없습니다: {symbol}'}), 404
-            
-            quote = quote_data[0]
-            
-            stock_data = {
-                'symbol': quote['symbol'],
-                'name': quote.get('name', symbol),
-                'price': float(quote['price']),
-                'change': float(quote.get('change', 0)),
-                'changePercent': float(quote.get('changesPercentage', 0)),
-                'currency': 'USD',
-                'timestamp': datetime.now().isoformat(),
-                'source': 'fmp_api'
-            }
-            
-            # 캐시 저장
-            cache[cache_key] = {
-                'data': stock_data,
-                'time': current_time
-            }
-            
-            return jsonify(stock_data)
-            
+            entries = load_stock_entries(symbols)
         except Exception as e:
-            logger.error(f"Stock data error: {e}")
+            logger.error(f"Quotes error: {e}")
             return jsonify({
                 'error': '주식 정보를 가져올 수 없습니다',
                 'details': str(e)
             }), 500
-            
+        
+        quotes = {
+            symbol: orjson.loads(entry[0])
+            for symbol, entry in entries.items()
+            if entry is not None
+        }
+        
+        return etag_json_response({
+            'quotes': quotes,
+            'missing': [symbol for symbol in symbols if symbol not in quotes],
+            'count': len(quotes)
+        }, STOCK_CACHE_CONTROL)
+        
     except Exception as e:
-        logger.error(f"Stock endpoint error: {e}")
+        logger.error(f"Quotes endpoint error: {e}")
         return jsonify({
             'error': '서버 오류가 발생했습니다',
             'details': str(e)
@@ -488,66 +1023,75 @@ def get_stock_data(symbol):
 def get_exchange_rate():
     """환율 정보"""
     try:
-        cache_key = 'exchange_rate'
-        current_time = time.time()
-        
-        if cache_key in cache and (current_time - cache[cache_key]['time']) < CACHE_DURATION:
-            return jsonify(cache[cache_key]['data'])
-        
-        default_rate = 1300.0
-        
-        try:
-            response = requests.get(
-                'https://api.exchangerate-api.com/v4/latest/USD',
-                timeout=5
-            )
-            response.raise_for_status()
-            data = response.json()
-            rate = data['rates'].get('KRW', default_rate)
-        except:
-            rate = default_rate
-        
-        result = {
-            'rate': rate,
-            'timestamp': datetime.now().isoformat(),
-            'source': 'API' if rate != default_rate else 'Default'
-        }
-        
-        cache[cache_key] = {'data': result, 'time': current_time}
-        return jsonify(result)
+        entry, _ = cache_get_or_compute(EXCHANGE_RATE_CACHE_KEY, load_exchange_rate_entry)
+        return cached_json_response(entry, API_CACHE_CONTROL)
         
     except Exception as e:
         logger.error(f"Exchange rate error: {e}")
         return jsonify({
-            'rate': 1300.0,
+            'rate': DEFAULT_EXCHANGE_RATE,
             'timestamp': datetime.now().isoformat(),
             'source': 'Error Fallback'
         })
 
+def validate_strategy(data):
+    """전략 저장 요청 검증 (문제가 있으면 오류 메시지 반환)"""
+    if not isinstance(data, dict):
+        return '전략 데이터는 JSON 객체여야 합니다'
+    
+    if not isinstance(data.get('name', ''), str):
+        return '전략 이름은 문자열이어야 합니다'
+    
+    # 입력창이 비어 있으면 빈 문자열이 오므로 값이 있을 때만 숫자인지 확인
+    for field in STRATEGY_NUMBER_FIELDS:
+        value = data.get(field)
+        if value is None or value == '':
+            continue
+        try:
+            if isinstance(value, bool) or not math.isfinite(float(value)):
+                raise ValueError
+        except (TypeError, ValueError):
+            return f'{field} 값은 숫자여야 합니다'
+    
+    return None
+
 @app.route('/api/strategy', methods=['GET', 'POST'])
 def manage_strategy():
     """전략 관리"""
     try:
         if request.method == 'GET':
-            return jsonify({
-                'strategies': list(strategies.values()),
-                'count': len(strategies)
-            })
+            saved = list_strategies()
+            # 본문 기반 ETag라 전략이 저장되면 자동으로 달라짐
+            return etag_json_response({
+                'strategies': saved,
+                'count': len(saved)
+            }, STRATEGY_CACHE_CONTROL)
         
         elif request.method == 'POST':
-            data = request.get_json()
+            # 잘못된 JSON은 예외 대신 None으로 받아 400으로 응답
+            data = request.get_json(silent=True)
             if not data:
                 return jsonify({'error': '데이터가 필요합니다'}), 400
             
-            strategy_id = f"strategy_{int(time.time())}"
+            error = validate_strategy(data)
+            if error:
+                return jsonify({'error': error}), 400
+            
+            # 초 단위 시각은 같은 초에 저장된 전략끼리 id가 겹쳐 서로 덮어쓰므로 UUID 사용
+            strategy_id = f"strategy_{uuid.uuid4().hex}"
+            # id와 저장 시각은 서버가 정하며, 요청 본문의 값으로 다른 전략을 덮어쓰지 못하게 제외
+            fields = {
+                key: value for key, value in data.items()
+                if key not in ('id', 'timestamp')
+            }
             strategy_data = {
                 'id': strategy_id,
-                'name': data.get('name', '새 전략'),
+                'name': fields.get('name', '새 전략'),
                 'timestamp': datetime.now().isoformat(),
-                **data
+                **fields
             }
             
-            strategies[strategy_id] = strategy_data
+            save_strategy(strategy_data)
             
             return jsonify({
                 'message': '전략이 저장되었습니다',
@@ -561,6 +1105,66 @@ def manage_strategy():
             'details': str(e)
         }), 500
 
+def dispatch_batch_item(item):
+    """배치 요청 항목 하나를 앱 내부에서 처리"""
+    if not isinstance(item, dict) or not isinstance(item.get('url'), str):
+        return {'status': 400, 'body': {'error': '잘못된 요청 항목입니다'}}
+    
+    url = item['url']
+    method = str(item.get('method', 'GET')).upper()
+    
+    # 배치 안에서 배치를 다시 호출하거나 API 외 경로를 호출하는 것은 허용하지 않음
+    if not url.startswith('/api/') or url.startswith('/api/batch'):
+        return {'status': 400, 'body': {'error': f'지원하지 않는 URL입니다: {url}'}}
+    
+    with app.test_request_context(url, method=method, json=item.get('body')):
+        response = app.full_dispatch_request()
+    
+    return {
+        'status': response.status_code,
+        'body': response.get_json(silent=True)
+    }
+
+@app.route('/api/batch', methods=['POST'])
+def batch_requests():
+    """여러 API 요청을 한 번에 처리"""
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('requests') if isinstance(data, dict) else None
+        
+        if not isinstance(items, list) or len(items) == 0:
+            return jsonify({'error': 'requests 목록이 필요합니다'}), 400
+        
+        if len(items) > BATCH_MAX_REQUESTS:
+            return jsonify({
+                'error': f'한 번에 최대 {BATCH_MAX_REQUESTS}개까지 요청할 수 있습니다'
+            }), 400
+        
+        # id가 없으면 순번을 쓰고, 응답을 id로 묶으므로 문자열이 아니거나 겹치는 id는 거부
+        ids = [
+            item['id'] if isinstance(item, dict) and 'id' in item else str(index)
+            for index, item in enumerate(items)
+        ]
+        if not all(isinstance(item_id, str) for item_id in ids):
+            return jsonify({'error': '요청 id는 문자열이어야 합니다'}), 400
+        if len(set(ids)) != len(ids):
+            return jsonify({'error': '요청 id가 중복되었습니다'}), 400
+        
+        # 업스트림 호출이 I/O 대기이므로 스레드 풀에서 동시에 처리
+        responses = dict(zip(ids, EXECUTOR.map(dispatch_batch_item, items)))
+        
+        return jsonify({
+            'responses': responses,
+            'count': len(responses)
+        })
+        
+    except Exception as e:
+        logger.error(f"Batch error: {e}")
+        return jsonify({
+            'error': '배치 요청 처리 중 오류가 발생했습니다',
+            'details': str(e)
+        }), 500
+
 # ============================================
 # 에러 핸들러
 # ============================================
@@ -579,12 +1183,29 @@ def internal_error(error):
         'message': '서버 내부 오류가 발생했습니다'
     }), 500
 
+# ============================================
+# 콜드 스타트 워밍업 (Vercel 환경용)
+# ============================================
+
+def warmup():
+    """첫 요청 전에 환율과 자주 조회되는 종목 시세 캐시, 업스트림 커넥션을 미리 준비"""
+    try:
+        # 환율 조회 과정에서 환율 API와의 TLS 연결도 함께 열어 둠
+        cache_get_or_compute(EXCHANGE_RATE_CACHE_KEY, load_exchange_rate_entry)
+        # 인기 종목 시세는 FMP 요청 한 번으로 받아 두며, 이 요청이 FMP 커넥션도 열어둠
+        load_stock_entries(WARMUP_SYMBOLS)
+    except Exception as e:
+        logger.warning(f"Warmup failed: {e}")
+
+if IS_VERCEL:
+    # import를 막지 않도록 백그라운드에서 실행
+    threading.Thread(target=warmup, daemon=True).start()
+
 # ============================================
 # Vercel 핸들러
 # ============================================
 
-if __name__ != '__main__':
-    application = app
-else:
-    if __name__ == '__main__':
-        app.run(debug=True, port=5000)
+application = app
+
+if __name__ == '__main__':
+    app.run(debug=True, port=5000)
@@ -0,0 +1,669 @@
+const DEFAULT_STRATEGY_NAME = '기본 전략';
+let currentStockPrice = 0;
+let isUSD = false;
+let exchangeRate = 1300;
+
+// API 기본 URL (실제 API 연결)
+const API_BASE_URL = window.location.hostname === 'localhost' 
+    ? 'http://localhost:3000' 
+    : window.location.origin;
+
+// 입력마다 다시 찾지 않도록 자주 쓰는 요소를 한 번만 조회 (defer로 불러오므로 본문 파싱 후 실행됨)
+const basePriceInput = document.getElementById('basePrice');
+const investmentAmountInput = document.getElementById('investmentAmount');
+const dropRateInput = document.getElementById('dropRate');
+const firstTargetProfitInput = document.getElementById('firstTargetProfit');
+const otherTargetProfitInput = document.getElementById('otherTargetProfit');
+const investmentTableBody = document.getElementById('investmentTableBody');
+const investmentRowTemplate = document.getElementById('investmentRowTemplate').content.firstElementChild;
+const sellPreviewTableBody = document.getElementById('sellPreviewTableBody');
+const investmentRows = investmentTableBody.rows;  // 행 추가/삭제가 자동 반영되는 live 컬렉션
+const sellPreviewRows = sellPreviewTableBody.rows;
+
+// API 응답 캐시: Map의 삽입 순서를 이용한 LRU (TTL 1분) + 진행 중인 요청 공유
+const API_CACHE_LIMIT = 64;
+const API_CACHE_TTL = 60 * 1000;
+const searchCache = new Map();
+const stockCache = new Map();
+const inflightRequests = new Map();
+
+// {ok, data} 형태로 반환하며, 성공한 응답만 캐시
+function fetchJsonCached(cache, key, url, signal) {
+    const hit = cache.get(key);
+    if (hit && Date.now() - hit.time < API_CACHE_TTL) {
+        // 최근 사용 항목으로 순서 갱신
+        cache.delete(key);
+        cache.set(key, hit);
+        return Promise.resolve(hit.result);
+    }
+    
+    let request = inflightRequests.get(url);
+    if (!request) {
+        request = fetch(url, {signal})
+            .then(async response => ({ok: response.ok, data: await response.json()}))
+            .then(result => {
+                if (result.ok) {
+                    cache.delete(key);
+                    cache.set(key, {result, time: Date.now()});
+                    if (cache.size > API_CACHE_LIMIT) {
+                        cache.delete(cache.keys().next().value);
+                    }
+                }
+                return result;
+            })
+            .finally(() => forgetInflight(url, request));
+        inflightRequests.set(url, request);
+        
+        if (signal) {
+            // 취소된 요청을 바로 다음 호출이 공유하지 않도록 즉시 제거
+            signal.addEventListener('abort', () => forgetInflight(url, request));
+        }
+    }
+    
+    return request;
+}
+
+function forgetInflight(url, request) {
+    if (inflightRequests.get(url) === request) {
+        inflightRequests.delete(url);
+    }
+}
+
+// 주식 검색 함수 (자동완성) - 개선된 버전
+let searchTimeout;
+let searchAbort = null;
+async function searchStocks() {
+    const query = document.getElementById('stockSymbol').value.trim();
+    const resultsDiv = document.getElementById('searchResults');
+    
+    // 이전 검색 취소 (대기 중인 검색과 이미 보낸 요청 모두)
+    clearTimeout(searchTimeout);
+    if (searchAbort) {
+        searchAbort.abort();
+        searchAbort = null;
+    }
+    
+    // 입력이 없으면 검색 결과 숨기기
+    if (query.length < 1) {
+        resultsDiv.style.display = 'none';
+        return;
+    }
+    
+    // 300ms 후에 검색 실행 (타이핑 중에는 검색하지 않음)
+    searchTimeout = setTimeout(async () => {
+        const controller = searchAbort = new AbortController();
+        try {
+            console.log(`🔍 검색 시작: ${query}`);
+            
+            // 로딩 표시
+            resultsDiv.innerHTML = '<div class="search-loading">🔍 검색 중...</div>';
+            resultsDiv.style.display = 'block';
+            
+            const {data} = await fetchJsonCached(
+                searchCache,
+                query.toLowerCase(),
+                `${API_BASE_URL}/api/search/${encodeURIComponent(query)}`,
+                controller.signal
+            );
+            
+            console.log(`✅ 검색 결과: ${data.count}개`);
+            displaySearchResults(data.results);
+        } catch (error) {
+            // 새 입력으로 취소된 검색은 결과를 표시하지 않음
+            if (error.name === 'AbortError') {
+                return;
+            }
+            console.error('검색 오류:', error);
+            resultsDiv.innerHTML = '<div class="search-error">❌ 검색 중 오류가 발생했습니다</div>';
+        }
+    }, 300);
+}
+
+function createTextElement(tag, className, text) {
+    const element = document.createElement(tag);
+    element.className = className;
+    element.textContent = text;
+    return element;
+}
+
+// 검색 결과 항목 생성 (textContent/dataset으로 넣으므로 따옴표 이스케이프가 필요 없음)
+function createSearchResultItem(result) {
+    const item = document.createElement('div');
+    item.className = 'search-result-item';
+    item.dataset.symbol = result.symbol;
+    item.dataset.name = result.name;
+    
+    // 국가 플래그와 통화 표시
+    const header = document.createElement('div');
+    header.className = 'search-result-header';
+    header.append(
+        createTextElement('span', 'search-result-symbol', result.symbol),
+        createTextElement('span', 'search-result-country', result.country || '🌍')
+    );
+    
+    const details = document.createElement('div');
+    details.className = 'search-result-details';
+    details.append(
+        createTextElement('span', 'search-result-exchange', result.exchange),
+        createTextElement('span', 'search-result-currency', result.currency || 'USD')
+    );
+    
+    item.append(header, createTextElement('div', 'search-result-name', result.name), details);
+    return item;
+}
+
+// 검색 결과 표시 - 개선된 버전
+function displaySearchResults(results) {
+    const resultsDiv = document.getElementById('searchResults');
+    
+    if (results.length === 0) {
+        resultsDiv.innerHTML = '<div class="search-no-results">📭 검색 결과가 없습니다</div>';
+        return;
+    }
+    
+    // 항목을 프래그먼트에 모아 한 번에 교체
+    const fragment = document.createDocumentFragment();
+    results.forEach(result => fragment.appendChild(createSearchResultItem(result)));
+    
+    resultsDiv.replaceChildren(fragment);
+    resultsDiv.style.display = 'block';
+}
+
+// 주식 선택 - 개선된 버전
+function selectStock(symbol, name) {
+    console.log(`🔍 주식 선택: ${symbol} - ${name}`);
+    document.getElementById('stockSymbol').value = symbol;
+    document.getElementById('searchResults').style.display = 'none';
+    
+    // 자동으로 주식 정보 조회
+    searchStock();
+}
+
+// 검색 결과 클릭은 항목마다 리스너를 달지 않고 목록 하나에서 처리
+document.getElementById('searchResults').addEventListener('click', function(event) {
+    const item = event.target.closest('.search-result-item');
+    if (item) {
+        selectStock(item.dataset.symbol, item.dataset.name);
+    }
+});
+
+// 검색 결과 외부 클릭시 숨기기
+document.addEventListener('click', function(event) {
+    const searchContainer = document.querySelector('.search-container');
+    if (!searchContainer.contains(event.target)) {
+        document.getElementById('searchResults').style.display = 'none';
+    }
+});
+
+// Enter 키로 첫 번째 결과 선택
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'Enter') {
+        const searchInput = document.getElementById('stockSymbol');
+        if (event.target === searchInput) {
+            const firstResult = document.querySelector('.search-result-item');
+            if (firstResult) {
+                firstResult.click();
+            } else {
+                searchStock(); // 검색 결과가 없으면 직접 조회
+            }
+        }
+    }
+});
+
+// 환율 정보 가져오기
+async function fetchExchangeRate() {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/exchange-rate`);
+        const data = await response.json();
+        
+        if (data.rate) {
+            exchangeRate = data.rate;
+            console.log(`환율 업데이트: 1 USD = ${exchangeRate} KRW`);
+        }
+    } catch (error) {
+        console.error('환율 정보 가져오기 실패:', error);
+        // 기본값 사용
+    }
+}
+
+// Stock Search - 실제 API 연결
+let stockAbort = null;
+async function searchStock(button) {
+    const symbol = document.getElementById('stockSymbol').value.trim().toUpperCase();
+    if (!symbol) {
+        alert('주식 심볼을 입력해주세요.');
+        return;
+    }
+
+    // Enter 키나 검색 결과 선택으로 호출되면 조회 버튼에 로딩 표시
+    button = button || document.querySelector('.search-btn');
+    
+    // 조회 중에 다시 호출되면 이전 조회를 취소하고 마지막 요청만 반영
+    if (stockAbort) {
+        stockAbort.abort();
+    } else {
+        button.dataset.originalText = button.innerHTML;
+    }
+    const controller = stockAbort = new AbortController();
+    
+    button.innerHTML = '<div class="loading"></div>';
+    button.disabled = true;
+
+    try {
+        const {ok, data: stockData} = await fetchJsonCached(
+            stockCache,
+            symbol,
+            `${API_BASE_URL}/api/stock/${symbol}`,
+            controller.signal
+        );
+        
+        if (ok) {
+            displayStockInfo(stockData);
+        } else {
+            throw new Error(stockData.error || '주식 정보를 가져올 수 없습니다.');
+        }
+    } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        console.error('주식 조회 오류:', error);
+        alert(`주식 정보 조회에 실패했습니다: ${error.message}`);
+    } finally {
+        // 더 최근 조회가 진행 중이면 버튼 상태는 그 조회가 복원
+        if (stockAbort === controller) {
+            stockAbort = null;
+            button.innerHTML = button.dataset.originalText;
+            button.disabled = false;
+        }
+    }
+}
+
+// Currency Toggle
+function toggleCurrency() {
+    isUSD = !isUSD;
+    const headerToggle = document.getElementById('headerCurrencyToggle');
+    const headerKrwLabel = document.getElementById('headerKrwLabel');
+    const headerUsdLabel = document.getElementById('headerUsdLabel');
+    
+    // 요소마다 클래스를 한 번에 지정해 스타일 재계산을 한 번으로 줄임
+    headerToggle.className = 'header-toggle-switch' + (isUSD ? ' active' : '');
+    headerKrwLabel.className = 'header-currency-label ' + (isUSD ? 'inactive' : 'active');
+    headerUsdLabel.className = 'header-currency-label ' + (isUSD ? 'active' : 'inactive');
+    
+    scheduleUpdate(updateInvestmentTable);
+}
+
+// toLocaleString은 호출마다 포맷터를 새로 만들므로 한 번 만든 포맷터를 재사용
+const USD_FORMAT = new Intl.NumberFormat('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+const KRW_FORMAT = new Intl.NumberFormat('ko-KR');
+
+function formatCurrency(amount) {
+    if (isUSD) {
+        return '$' + USD_FORMAT.format(amount);
+    } else {
+        // 일의 자리에서 올림 처리
+        const roundedAmount = Math.ceil(amount / 10) * 10;
+        return KRW_FORMAT.format(roundedAmount) + '원';
+    }
+}
+
+function displayStockInfo(stockData) {
+    document.getElementById('stockName').textContent = stockData.name;
+    
+    let displayPrice = stockData.price;
+    let displayCurrency = stockData.currency;
+    let displayChange = stockData.change;
+    
+    if (isUSD && stockData.currency === 'KRW') {
+        displayPrice = stockData.price / exchangeRate;
+        displayCurrency = 'USD';
+        displayChange = stockData.change / exchangeRate;
+    } else if (!isUSD && stockData.currency === 'USD') {
+        displayPrice = stockData.price * exchangeRate;
+        displayCurrency = 'KRW';
+        displayChange = stockData.change * exchangeRate;
+    }
+    
+    document.getElementById('currentPrice').textContent = displayPrice.toLocaleString();
+    document.getElementById('currency').textContent = displayCurrency;
+    
+    const changeElement = document.getElementById('priceChange');
+    const changeAmount = document.getElementById('changeAmount');
+    const changePercent = document.getElementById('changePercent');
+    
+    const isPositive = stockData.change >= 0;
+    changeElement.className = `stock-change ${isPositive ? 'positive' : 'negative'}`;
+    
+    changeAmount.textContent = `${isPositive ? '+' : ''}${displayChange.toLocaleString()}`;
+    changePercent.textContent = `(${isPositive ? '+' : ''}${stockData.changePercent.toFixed(2)}%)`;
+    
+    document.getElementById('lastUpdate').textContent = `최종 업데이트: ${new Date().toLocaleString('ko-KR')}`;
+    document.getElementById('stockInfo').style.display = 'block';
+    
+    currentStockPrice = displayPrice;
+    document.getElementById('useCurrentPrice').checked = false;
+}
+
+function resetStockInfo() {
+    ['stockName', 'currentPrice', 'changeAmount', 'changePercent', 'lastUpdate'].forEach(id => {
+        document.getElementById(id).textContent = '-';
+    });
+    document.getElementById('currency').textContent = 'USD';
+    document.getElementById('priceChange').className = 'stock-change';
+    currentStockPrice = 0;
+}
+
+function toggleCurrentPrice() {
+    const checkbox = document.getElementById('useCurrentPrice');
+    
+    if (checkbox.checked && currentStockPrice > 0) {
+        basePriceInput.value = currentStockPrice;
+        scheduleUpdate(updateInvestmentTable);
+        
+        basePriceInput.style.background = 'rgba(16, 185, 129, 0.1)';
+        basePriceInput.style.borderColor = 'var(--success-green)';
+        setTimeout(() => {
+            basePriceInput.style.background = '';
+            basePriceInput.style.borderColor = '';
+        }, 2000);
+    } else if (checkbox.checked && currentStockPrice === 0) {
+        checkbox.checked = false;
+        alert('먼저 주식 정보를 조회해주세요.');
+    }
+}
+
+// 한 프레임 안에 들어온 입력을 모아 다음 requestAnimationFrame에서 한 번만 다시 그림
+const scheduledUpdates = new Set();
+let updateFrame = 0;
+
+function scheduleUpdate(update) {
+    scheduledUpdates.add(update);
+    if (updateFrame) {
+        return;
+    }
+    
+    updateFrame = requestAnimationFrame(() => {
+        updateFrame = 0;
+        // 투자 테이블 갱신이 매도 미리보기까지 다시 그리므로 중복 실행하지 않음
+        if (scheduledUpdates.has(updateInvestmentTable)) {
+            scheduledUpdates.delete(updateSellPreview);
+        }
+        const updates = [...scheduledUpdates];
+        scheduledUpdates.clear();
+        updates.forEach(run => run());
+    });
+}
+
+// Investment Table Updates
+function updateInvestmentTable() {
+    const basePrice = parseFloat(basePriceInput.value) || 0;
+    const targetInvestment = parseFloat(investmentAmountInput.value) || 0;
+    const dropRateStep = parseFloat(dropRateInput.value) || 5;
+
+    for (let index = 0; index < investmentRows.length; index++) {
+        const cells = investmentRows[index].cells;
+        const cumulativeDropRate = index * dropRateStep;
+        const buyPrice = basePrice * (1 - cumulativeDropRate / 100);
+        
+        cells[1].textContent = cumulativeDropRate + '%';
+        cells[2].textContent = formatCurrency(buyPrice);
+        
+        const quantity = targetInvestment > 0 && buyPrice > 0 ? Math.floor(targetInvestment / buyPrice) : 0;
+        cells[3].textContent = KRW_FORMAT.format(quantity) + '주';
+        
+        const actualInvestment = quantity * buyPrice;
+        cells[4].textContent = formatCurrency(actualInvestment);
+    }
+
+    updateSellPreview();
+}
+
+function updateSellPreview() {
+    const basePrice = parseFloat(basePriceInput.value) || 0;
+    const dropRateStep = parseFloat(dropRateInput.value) || 5;
+    const firstTargetProfit = parseFloat(firstTargetProfitInput.value) || 0;
+    const otherTargetProfit = parseFloat(otherTargetProfitInput.value) || 0;
+    
+    const rowCount = investmentRows.length;
+    syncSellPreviewRows(rowCount);
+    
+    for (let index = 0; index < rowCount; index++) {
+        const cells = sellPreviewRows[index].cells;
+        const orderNum = index + 1;
+        const cumulativeDropRate = index * dropRateStep;
+        const buyPrice = basePrice * (1 - cumulativeDropRate / 100);
+        
+        // 1차 매수는 firstTargetProfit, 나머지는 otherTargetProfit 사용
+        const targetProfit = orderNum === 1 ? firstTargetProfit : otherTargetProfit;
+        const sellPrice = buyPrice * (1 + targetProfit / 100);
+        
+        cells[0].firstChild.textContent = `${orderNum}차`;
+        cells[1].textContent = formatCurrency(buyPrice);
+        cells[2].textContent = `${targetProfit}%`;
+        cells[3].textContent = formatCurrency(sellPrice);
+    }
+}
+
+// 매도 미리보기 행 수를 매수 차수에 맞춤 (기존 행은 재사용하고 글자만 갱신)
+function syncSellPreviewRows(rowCount) {
+    while (sellPreviewRows.length > rowCount) {
+        sellPreviewRows[sellPreviewRows.length - 1].remove();
+    }
+    
+    if (sellPreviewRows.length < rowCount) {
+        const fragment = document.createDocumentFragment();
+        for (let index = sellPreviewRows.length; index < rowCount; index++) {
+            const tr = document.createElement('tr');
+            tr.innerHTML = '<td><strong></strong></td><td></td><td></td><td></td>';
+            fragment.appendChild(tr);
+        }
+        sellPreviewTableBody.appendChild(fragment);
+    }
+}
+
+// 매수 차수 행 생성 (1차는 삭제할 수 없음)
+function createInvestmentRow(orderNum, dropRate) {
+    const tr = investmentRowTemplate.cloneNode(true);
+    tr.cells[0].firstChild.textContent = `${orderNum}차`;
+    tr.cells[1].textContent = `${dropRate}%`;
+    if (orderNum === 1) {
+        tr.cells[5].textContent = '-';
+    }
+    return tr;
+}
+
+// 초기화 때 되돌릴 첫 화면 행 (서버가 index.html에 넣어 둔 행을 보관)
+const initialInvestmentRows = Array.from(investmentRows, row => row.cloneNode(true));
+let investmentRowCount = initialInvestmentRows.length;
+
+function renderInitialInvestmentRows() {
+    investmentTableBody.replaceChildren(...initialInvestmentRows.map(row => row.cloneNode(true)));
+    investmentRowCount = initialInvestmentRows.length;
+}
+
+function addInvestmentRow() {
+    investmentRowCount++;
+    const dropRateStep = parseFloat(dropRateInput.value) || 5;
+    const newDropRate = (investmentRowCount - 1) * dropRateStep;
+    
+    investmentTableBody.appendChild(createInvestmentRow(investmentRowCount, newDropRate));
+    scheduleUpdate(updateInvestmentTable);
+}
+
+function removeInvestmentRow(button) {
+    if (investmentRows.length > 1) {
+        button.closest('tr').remove();
+        
+        for (let index = 0; index < investmentRows.length; index++) {
+            investmentRows[index].cells[0].innerHTML = `<strong>${index + 1}차</strong>`;
+        }
+        investmentRowCount = investmentRows.length;
+        scheduleUpdate(updateInvestmentTable);
+    } else {
+        alert('최소 1개의 매수 차수는 유지되어야 합니다.');
+    }
+}
+
+// Strategy Management
+async function saveStrategy(btn) {
+    const strategyData = {
+        name: document.getElementById('currentStrategyName').textContent || DEFAULT_STRATEGY_NAME,
+        currency: isUSD ? 'USD' : 'KRW',
+        basePrice: basePriceInput.value,
+        investmentAmount: investmentAmountInput.value,
+        dropRate: dropRateInput.value,
+        firstTargetProfit: firstTargetProfitInput.value,
+        otherTargetProfit: otherTargetProfitInput.value,
+        stockSymbol: document.getElementById('stockSymbol').value,
+        investmentRows: investmentRowCount
+    };
+    
+    const originalText = btn.textContent;
+    
+    try {
+        btn.textContent = '저장 중...';
+        btn.disabled = true;
+        
+        const response = await fetch(`${API_BASE_URL}/api/strategy`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(strategyData)
+        });
+        
+        const result = await response.json();
+        
+        if (response.ok) {
+            btn.textContent = '✅ 저장 완료!';
+            btn.style.background = 'var(--success-green)';
+            
+            setTimeout(() => {
+                btn.textContent = originalText;
+                btn.style.background = '';
+                btn.disabled = false;
+            }, 2000);
+        } else {
+            throw new Error(result.error || '저장에 실패했습니다.');
+        }
+    } catch (error) {
+        console.error('전략 저장 오류:', error);
+        alert(`전략 저장에 실패했습니다: ${error.message}`);
+        btn.textContent = originalText;
+        btn.disabled = false;
+    }
+}
+
+async function loadStrategies() {
+    try {
+        const response = await fetch(`${API_BASE_URL}/api/strategy`);
+        const data = await response.json();
+        
+        const select = document.getElementById('strategySelect');
+        
+        // 기존 옵션 제거 (첫 번째 옵션 제외)
+        while (select.children.length > 1) {
+            select.removeChild(select.lastChild);
+        }
+        
+        // 저장된 전략들 추가
+        if (data.strategies && data.strategies.length > 0) {
+            data.strategies.forEach(strategy => {
+                const option = document.createElement('option');
+                option.value = strategy.id;
+                option.textContent = strategy.name;
+                select.appendChild(option);
+            });
+        }
+    } catch (error) {
+        console.error('전략 목록 로딩 오류:', error);
+    }
+}
+
+function saveAsStrategy() {
+    const name = prompt('새로운 전략 이름을 입력하세요:');
+    if (name) {
+        alert(`"${name}" 전략이 저장되었습니다! 📋`);
+        document.getElementById('currentStrategyName').textContent = name;
+    }
+}
+
+function loadStrategy() {
+    const select = document.getElementById('strategySelect');
+    if (select.value) {
+        alert(`"${select.options[select.selectedIndex].text}" 전략을 불러왔습니다! 📂`);
+        document.getElementById('currentStrategyName').textContent = select.options[select.selectedIndex].text;
+    }
+}
+
+// 페이지를 새로 불러오지 않고 처음 상태로 되돌림 (환율, 저장된 전략 목록, API 캐시는 유지)
+function resetStrategy() {
+    if (!confirm('모든 설정을 초기화하시겠습니까?')) {
+        return;
+    }
+    
+    // 진행 중인 주식 조회는 취소 (조회 버튼은 searchStock이 복원)
+    if (stockAbort) {
+        stockAbort.abort();
+    }
+    
+    // 입력창과 체크박스는 HTML에 적힌 기본값으로
+    document.querySelectorAll('input').forEach(input => {
+        input.value = input.defaultValue;
+        input.checked = input.defaultChecked;
+    });
+    document.getElementById('strategySelect').selectedIndex = 0;
+    document.getElementById('currentStrategyName').textContent = DEFAULT_STRATEGY_NAME;
+    
+    // 검색어가 비었으므로 대기 중인 검색을 취소하고 결과를 숨김.
+    // 이전 결과 항목이 남아 있으면 Enter 키가 숨겨진 항목을 선택하므로 비움
+    searchStocks();
+    document.getElementById('searchResults').replaceChildren();
+    resetStockInfo();
+    document.getElementById('stockInfo').style.display = 'none';
+    
+    if (!isUSD) {
+        toggleCurrency();
+    }
+    
+    renderInitialInvestmentRows();
+    scheduleUpdate(updateInvestmentTable);
+}
+
+// 이벤트 위임: 요소마다 인라인 핸들러를 두지 않고 data-* 속성에 적힌 동작을 호출
+const ACTIONS = {
+    toggleCurrency, saveStrategy, saveAsStrategy, resetStrategy, loadStrategy,
+    searchStocks, searchStock, toggleCurrentPrice,
+    addInvestmentRow, removeInvestmentRow,
+    updateInvestmentTable: () => scheduleUpdate(updateInvestmentTable),
+    updateSellPreview: () => scheduleUpdate(updateSellPreview)
+};
+
+function bindActions(eventType, attribute) {
+    document.addEventListener(eventType, function(event) {
+        const target = event.target.closest(`[${attribute}]`);
+        if (target) {
+            ACTIONS[target.getAttribute(attribute)](target);
+        }
+    });
+}
+
+bindActions('click', 'data-action');
+bindActions('input', 'data-input');
+bindActions('change', 'data-change');
+
+// Event Listeners
+document.addEventListener('DOMContentLoaded', async function() {
+    document.getElementById('stockSymbol').addEventListener('keypress', function(e) {
+        if (e.key === 'Enter') {
+            searchStock();
+        }
+    });
+    
+    document.getElementById('headerUsdLabel').classList.add('active');
+    isUSD = true;
+    
+    // 초기 데이터 로딩 (서로 독립적이므로 동시에 요청)
+    await Promise.all([fetchExchangeRate(), loadStrategies()]);
+    updateInvestmentTable();
+});